@@ -1,3 +1,4 @@
+import functools
 import os
 from typing import cast
 from lark import Lark
@@ -6,6 +7,7 @@ from lark.exceptions import UnexpectedInput
 from xb.grammar.syntax_errors import handle_unexpected_input
 from xb.grammar.transformer import AstTransformer
 from xb.interpreter.ast import Block
+from xb.interpreter.optimize import optimize
 
 transformer = AstTransformer()
 
@@ -14,24 +16,33 @@ transformer = AstTransformer()
 # lark.Tree representation.
 debug_tree = os.environ.get("XB_DEBUG") is not None
 
-parser = Lark.open(
-    "xb.lark",
-    rel_to=__file__,
-    start="block",
-    parser="lalr",
-    transformer=None if debug_tree else transformer,
-)
+
+@functools.cache
+def _get_parser(debug: bool) -> Lark:
+    # Built on first use so that importing the package stays cheap,
+    # and shared by every later parse in the process. The debug parser
+    # leaves the lark.Tree untransformed so that it can be printed.
+    return Lark.open(
+        "xb.lark",
+        rel_to=__file__,
+        start="block",
+        parser="lalr",
+        cache=True,
+        transformer=None if debug else transformer,
+    )
 
 
 def parse(src: str) -> Block:
+    parser = _get_parser(debug_tree)
+
     try:
         parse_result = parser.parse(src)
 
         if debug_tree:
             print(parse_result.pretty())
-            return cast(Block, AstTransformer().transform(parse_result))
+            parse_result = transformer.transform(parse_result)
 
-        return cast(Block, parse_result)
+        return cast(Block, optimize(parse_result))
 
     except UnexpectedInput as u:
         handle_unexpected_input(u, src, parser)
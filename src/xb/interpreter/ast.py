@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import sys
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Callable
 from lark import Token
 
@@ -12,31 +13,43 @@ from xb.interpreter.errors import XbRuntimeError
 
 class AstNode(ABC):
     # TODO: meta info?
-    pass
+
+    # Abstract nodes declare empty __slots__ so that the slotted
+    # dataclass nodes carry no per-instance __dict__.
+    __slots__ = ()
 
 
 class EvaluatableAstNode(AstNode):
+    __slots__ = ()
+
     @abstractmethod
     def evaluate(self, env: Environment) -> v.Value:
         raise NotImplementedError
 
 
-@dataclass
+@dataclass(slots=True)
 class Block(EvaluatableAstNode):
     exprs: list[Expr | None]
+    _stmts: tuple[Expr, ...] = field(init=False, repr=False, compare=False)
+    _ret: Expr | None = field(init=False, repr=False, compare=False)
 
-    def evaluate(self, env):
-        stmts, ret = self.exprs[:-1], self.exprs[-1]
+    def __post_init__(self):
+        # Split once here rather than slicing on every evaluation, and
+        # drop the empty statements so the loop does not test for them.
+        *stmts, self._ret = self.exprs
+        self._stmts = tuple(stmt for stmt in stmts if stmt is not None)
 
-        for stmt in stmts:
-            if stmt:
-                stmt.evaluate(env)
+    def evaluate(self, env):
+        for stmt in self._stmts:
+            stmt.evaluate(env)
 
-        return ret.evaluate(env) if ret else v.Empty()
+        return self._ret.evaluate(env) if self._ret is not None else v.EMPTY
 
 
 Assigner = Callable[[v.Value], None]
 class Expr(EvaluatableAstNode):
+    __slots__ = ()
+
     def evaluate_assignment_target(self, env: Environment) -> Assigner:
         """
         Most expressions cannot be assigned to. Valid assignment
@@ -48,29 +61,29 @@ class Expr(EvaluatableAstNode):
         raise XbRuntimeError("invalid assignment target")
 
 
-@dataclass
+@dataclass(slots=True)
 class ConstDecl(Expr):
     ident: Identifier
     expr: Expr
 
     def evaluate(self, env):
         value = self.expr.evaluate(env)
-        env.declare_const(str(self.ident.token), value)
+        env.declare_const(self.ident.name, value)
         return value
 
 
-@dataclass
+@dataclass(slots=True)
 class VarDecl(Expr):
     ident: Identifier
     expr: Expr
 
     def evaluate(self, env):
         value = self.expr.evaluate(env)
-        env.declare_var(str(self.ident.token), value)
+        env.declare_var(self.ident.name, value)
         return value
 
 
-@dataclass
+@dataclass(slots=True)
 class Assign(Expr):
     target: Expr
     expr: Expr
@@ -83,30 +96,30 @@ class Assign(Expr):
 
 
 class IfNode(Expr):
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class If(IfNode):
     condition_block: NestedBlock
     true_expr: Expr
     false_expr: Expr | None
 
     def evaluate(self, env):
-        if self.condition_block.evaluate(env):
+        if v.Boolean.truth(self.condition_block.evaluate(env)):
             return self.true_expr.evaluate(env)
 
         if self.false_expr is not None:
             return self.false_expr.evaluate(env)
 
-        return v.Empty()
+        return v.EMPTY
 
 
 class Logic(IfNode):
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class And(Logic):
     lhs: Logic
     rhs: Compare
@@ -116,7 +129,7 @@ class And(Logic):
         return self.lhs.evaluate(env) and self.rhs.evaluate(env)
 
 
-@dataclass
+@dataclass(slots=True)
 class Or(Logic):
     lhs: Logic
     rhs: Compare
@@ -127,10 +140,10 @@ class Or(Logic):
 
 
 class Compare(Logic):
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class Equal(Compare):
     lhs: Compare
     rhs: Sum
@@ -139,7 +152,7 @@ class Equal(Compare):
         return Op.eq(self.lhs.evaluate(env), self.rhs.evaluate(env))
 
 
-@dataclass
+@dataclass(slots=True)
 class NotEqual(Compare):
     lhs: Compare
     rhs: Sum
@@ -148,7 +161,7 @@ class NotEqual(Compare):
         return Op.neq(self.lhs.evaluate(env), self.rhs.evaluate(env))
 
 
-@dataclass
+@dataclass(slots=True)
 class LessThan(Compare):
     lhs: Compare
     rhs: Sum
@@ -157,7 +170,7 @@ class LessThan(Compare):
         return Op.lt(self.lhs.evaluate(env), self.rhs.evaluate(env))
 
 
-@dataclass
+@dataclass(slots=True)
 class GreaterThan(Compare):
     lhs: Compare
     rhs: Sum
@@ -166,7 +179,7 @@ class GreaterThan(Compare):
         return Op.gt(self.lhs.evaluate(env), self.rhs.evaluate(env))
 
 
-@dataclass
+@dataclass(slots=True)
 class LessThanOrEqual(Compare):
     lhs: Compare
     rhs: Sum
@@ -175,7 +188,7 @@ class LessThanOrEqual(Compare):
         return Op.lte(self.lhs.evaluate(env), self.rhs.evaluate(env))
 
 
-@dataclass
+@dataclass(slots=True)
 class GreaterThanOrEqual(Compare):
     lhs: Compare
     rhs: Sum
@@ -185,10 +198,10 @@ class GreaterThanOrEqual(Compare):
 
 
 class Sum(Logic):
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class Add(Sum):
     lhs: Sum
     rhs: Product
@@ -197,7 +210,7 @@ class Add(Sum):
         return Op.add(self.lhs.evaluate(env), self.rhs.evaluate(env))
 
 
-@dataclass
+@dataclass(slots=True)
 class Subtract(Sum):
     lhs: Sum
     rhs: Product
@@ -206,11 +219,40 @@ class Subtract(Sum):
         return Op.sub(self.lhs.evaluate(env), self.rhs.evaluate(env))
 
 
+BinaryOp = Callable[[v.Value, v.Value], v.Value]
+def evaluate_chain(operands: list[Expr], ops: list[BinaryOp], env: Environment) -> v.Value:
+    """
+    Evaluate a SumChain or ProductChain: left to right, with `ops[i]`
+    combining the running result with `operands[i + 1]`.
+    """
+    operand_iter = iter(operands)
+    acc = next(operand_iter).evaluate(env)
+
+    for op, rhs in zip(ops, operand_iter):
+        acc = op(acc, rhs.evaluate(env))
+
+    return acc
+
+
+@dataclass(slots=True)
+class SumChain(Sum):
+    """
+    A run of additions and subtractions, built by the optimizer in
+    place of nested Add/Subtract nodes. `ops[i]` combines the running
+    result with `operands[i + 1]`.
+    """
+    operands: list[Expr]
+    ops: list[BinaryOp]
+
+    def evaluate(self, env):
+        return evaluate_chain(self.operands, self.ops, env)
+
+
 class Product(Sum):
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class Multiply(Product):
     lhs: Product
     rhs: PowNode
@@ -219,7 +261,7 @@ class Multiply(Product):
         return Op.mul(self.lhs.evaluate(env), self.rhs.evaluate(env))
 
 
-@dataclass
+@dataclass(slots=True)
 class Divide(Product):
     lhs: Product
     rhs: PowNode
@@ -228,7 +270,7 @@ class Divide(Product):
         return Op.div(self.lhs.evaluate(env), self.rhs.evaluate(env))
 
 
-@dataclass
+@dataclass(slots=True)
 class IntegerDivide(Product):
     lhs: Product
     rhs: PowNode
@@ -237,7 +279,7 @@ class IntegerDivide(Product):
         return Op.int_div(self.lhs.evaluate(env), self.rhs.evaluate(env))
 
 
-@dataclass
+@dataclass(slots=True)
 class Mod(Product):
     lhs: Product
     rhs: PowNode
@@ -246,11 +288,24 @@ class Mod(Product):
         return Op.mod(self.lhs.evaluate(env), self.rhs.evaluate(env))
 
 
+@dataclass(slots=True)
+class ProductChain(Product):
+    """
+    A run of multiplicative operations, built by the optimizer in
+    place of nested Multiply/Divide/IntegerDivide/Mod nodes.
+    """
+    operands: list[Expr]
+    ops: list[BinaryOp]
+
+    def evaluate(self, env):
+        return evaluate_chain(self.operands, self.ops, env)
+
+
 class PowNode(Product):
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class Pow(PowNode):
     lhs: PowNode
     rhs: CoalesceNode
@@ -260,24 +315,24 @@ class Pow(PowNode):
 
 
 class CoalesceNode(PowNode):
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class Coalesce(CoalesceNode):
     lhs: CoalesceNode
     rhs: Unary
 
     def evaluate(self, env):
         left = self.lhs.evaluate(env)
-        return left if not Op.eq(left, v.Empty()) else self.rhs.evaluate(env)
+        return left if not Op.eq(left, v.EMPTY) else self.rhs.evaluate(env)
 
 
 class Unary(CoalesceNode):
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class Negate(Unary):
     val: Unary
 
@@ -285,7 +340,7 @@ class Negate(Unary):
         return Op.neg(self.val.evaluate(env))
 
 
-@dataclass
+@dataclass(slots=True)
 class Not(Unary):
     val: Unary
 
@@ -293,34 +348,33 @@ class Not(Unary):
         return Op.not_(self.val.evaluate(env))
 
 
-@dataclass
+@dataclass(slots=True)
 class Args(AstNode):
     exprs: list[Expr]
 
 
 class AccessOrCall(Unary):
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class KeyAccess(AccessOrCall):
     lhs: AccessOrCall
     key: Key
 
     def evaluate(self, env):
-        key = str(self.key.token)
-        return self.lhs.evaluate(env).key_get(key)
+        return self.lhs.evaluate(env).key_get(self.key.name)
 
     def evaluate_assignment_target(self, env) -> Assigner:
         target = self.lhs.evaluate(env)
-        key = str(self.key.token)
+        key = self.key.name
 
         def assign(v: v.Value):
             target.key_set(key, v)
         return assign
 
 
-@dataclass
+@dataclass(slots=True)
 class IndexAccess(AccessOrCall):
     lhs: AccessOrCall
     index_expr: Expr
@@ -338,7 +392,7 @@ class IndexAccess(AccessOrCall):
         return assign
 
 
-@dataclass
+@dataclass(slots=True)
 class Call(AccessOrCall):
     lhs: AccessOrCall
     args: Args
@@ -351,75 +405,119 @@ class Call(AccessOrCall):
 
 
 class Atom(AccessOrCall):
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class Identifier(Atom):
     token: Token
+    name: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Resolved once here instead of converting the token on every
+        # lookup. Interning lets dict lookups of the same name elsewhere
+        # match by identity.
+        self.name = sys.intern(str(self.token))
 
     def evaluate(self, env):
-        return env[self.token]
+        return env[self.name]
 
     def evaluate_assignment_target(self, env) -> Assigner:
         def assign(v: v.Value):
-            env[self.token] = v
+            env[self.name] = v
         return assign
 
 
-@dataclass
+@dataclass(slots=True)
 class Key(AstNode):
     token: Token
+    name: str = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self):
+        self.name = sys.intern(str(self.token))
 
-@dataclass
+
+@dataclass(slots=True)
 class NestedBlock(Atom):
     block: Block
+    # Cleared by the optimizer when nothing is ever declared in the
+    # block's own scope, which could then never be observed.
+    scoped: bool = True
 
     def evaluate(self, env):
-        inner_env = Environment(env)
+        inner_env = Environment(env) if self.scoped else env
         return self.block.evaluate(inner_env)
 
 
 class Literal(Atom):
-    pass
+    """
+    Literal values are immutable, so literals with a non-trivial
+    decoding step build their value once and share it between
+    evaluations. Decoding waits for the first evaluation, so that a
+    bad literal is only reported if it is actually reached.
+    """
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class Number(Literal):
     token: Token
+    value: v.Number | None = field(default=None, init=False, repr=False, compare=False)
 
     def evaluate(self, env):
-        return v.Number.from_node(self, env)
+        if self.value is None:
+            self.value = v.Number(v.Number._parse_string(self.token))
+
+        return self.value
 
 
-@dataclass
+@dataclass(slots=True)
 class String(Literal):
     token: Token
+    value: v.String | None = field(default=None, init=False, repr=False, compare=False)
 
     def evaluate(self, env):
-        return v.String.from_node(self, env)
+        if self.value is None:
+            self.value = v.String(eval(self.token))
+
+        return self.value
 
 
-@dataclass
+@dataclass(slots=True)
 class Bool(Literal):
     token: Token
+    value: v.Boolean = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.value = v.TRUE if self.token == "true" else v.FALSE
 
     def evaluate(self, env):
-        return v.Boolean.from_node(self, env)
+        return self.value
 
 
-@dataclass
+@dataclass(slots=True)
 class Empty(Literal):
     def evaluate(self, env):
-        return v.Empty.from_node(self, env)
+        return v.EMPTY
+
+
+@dataclass(slots=True)
+class Constant(Literal):
+    """
+    A value computed ahead of time by the optimizer rather than
+    written in the source.
+    """
+    value: v.Value
+
+    def evaluate(self, env):
+        return self.value
 
 
 class Construct(Atom):
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class Array(Construct):
     exprs: list[Expr]
 
@@ -428,39 +526,41 @@ class Array(Construct):
 
 
 class Pair(AstNode):
+    __slots__ = ()
+
     @abstractmethod
     def key_value_const(self, env: Environment) -> tuple[str, v.Value, bool]:
         raise NotImplementedError
 
 
-@dataclass
+@dataclass(slots=True)
 class InferPair(Pair):
     ident: Identifier
 
     def key_value_const(self, env):
-        name = str(self.ident.token)
-        return name, env[name], env.is_const(name)
+        name = self.ident.name
+        return name, *env.lookup(name)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConstPair(Pair):
     key: Key
     expr: Expr
 
     def key_value_const(self, env):
-        return str(self.key.token), self.expr.evaluate(env), True
+        return self.key.name, self.expr.evaluate(env), True
 
 
-@dataclass
+@dataclass(slots=True)
 class VarPair(Pair):
     key: Key
     expr: Expr
 
     def key_value_const(self, env):
-        return str(self.key.token), self.expr.evaluate(env), False
+        return self.key.name, self.expr.evaluate(env), False
 
 
-@dataclass
+@dataclass(slots=True)
 class Object(Construct):
     pairs: list[Pair]
 
@@ -468,12 +568,12 @@ class Object(Construct):
         return v.Object.from_node(self, env)
 
 
-@dataclass
+@dataclass(slots=True)
 class Params(AstNode):
     identifiers: list[Identifier]
 
 
-@dataclass
+@dataclass(slots=True)
 class Function(Construct):
     params: Params
     body: Expr
@@ -1,5 +1,4 @@
 from __future__ import annotations
-from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from xb.interpreter.errors import XbRuntimeError
@@ -8,53 +7,69 @@ if TYPE_CHECKING:
     from xb.interpreter.value import Value
 
 
-@dataclass
-class EnvironmentEntry:
-    value: Value
-    is_const: bool
-
-
 class Environment:
-    _dict: dict[str, EnvironmentEntry]
+    # Values and constness are kept apart so that reads, by far the most
+    # common access, are a single dict probe per scope.
+    _values: dict[str, Value]
+    _consts: set[str]
 
     def __init__(self, parent: Environment | None = None) -> None:
         self.parent = parent
 
-        self._dict = {}
+        self._values = {}
+        self._consts = set()
 
     def __getitem__(self, name: str) -> Value:
-        if name in self._dict.keys():
-            return self._dict[name].value
+        env = self
+        while env is not None:
+            value = env._values.get(name)
+            if value is not None:
+                return value
 
-        if self.parent:
-            return self.parent[name]
+            env = env.parent
 
         raise XbRuntimeError(f"name '{name}' not recognized in this scope")
 
     def __setitem__(self, name: str, value: Value) -> None:
-        if name in self._dict.keys():
-            if self._dict[name].is_const:
-                raise XbRuntimeError(f"name '{name}' is constant")
+        env = self._resolve(name)
+
+        if name in env._consts:
+            raise XbRuntimeError(f"name '{name}' is constant")
 
-            self._dict[name].value = value
+        env._values[name] = value
 
-        elif self.parent:
-            self.parent[name] = value
+    def _resolve(self, name: str) -> Environment:
+        # Walks the scope chain in a loop rather than recursing through
+        # each parent's __getitem__/__setitem__.
+        env = self
+        while env is not None:
+            if name in env._values:
+                return env
 
-        else:
-            raise XbRuntimeError(f"name '{name}' not recognized in this scope")
+            env = env.parent
+
+        raise XbRuntimeError(f"name '{name}' not recognized in this scope")
 
     def declare_const(self, name: str, value: Value) -> None:
-        if name in self._dict.keys():
+        if name in self._values:
             raise XbRuntimeError(f"name '{name}' is already bound")
 
-        self._dict[name] = EnvironmentEntry(value, True)
+        self._values[name] = value
+        self._consts.add(name)
 
     def declare_var(self, name: str, value: Value) -> None:
-        if name in self._dict.keys():
+        if name in self._values:
             raise XbRuntimeError(f"name '{name}' is already bound")
 
-        self._dict[name] = EnvironmentEntry(value, False)
+        self._values[name] = value
 
     def is_const(self, name: str) -> bool:
-        return self._dict[name].is_const
+        return name in self._resolve(name)._consts
+
+    def lookup(self, name: str) -> tuple[Value, bool]:
+        """
+        Get the value bound to `name` along with whether it is constant,
+        resolving the name only once.
+        """
+        env = self._resolve(name)
+        return env._values[name], name in env._consts
@@ -0,0 +1,271 @@
+"""
+Rewrites the AST produced by the parser before it is evaluated,
+replacing subtrees whose results are already known and reshaping
+others into forms that are cheaper to evaluate.
+"""
+
+from dataclasses import fields, replace
+
+import xb.interpreter.ast as t
+import xb.interpreter.value as v
+from xb.interpreter.environment import Environment
+from xb.interpreter.value import Op
+
+
+# Nodes whose result depends only on their operands, and the operation
+# each applies to them.
+FOLDABLE = {
+    t.Equal: Op.eq,
+    t.NotEqual: Op.neq,
+    t.LessThan: Op.lt,
+    t.GreaterThan: Op.gt,
+    t.LessThanOrEqual: Op.lte,
+    t.GreaterThanOrEqual: Op.gte,
+    t.Add: Op.add,
+    t.Subtract: Op.sub,
+    t.Multiply: Op.mul,
+    t.Divide: Op.div,
+    t.IntegerDivide: Op.int_div,
+    t.Mod: Op.mod,
+    t.Pow: Op.pow,
+    t.Negate: Op.neg,
+    t.Not: Op.not_,
+}
+
+# Literals need no bindings, so every literal evaluated while optimizing
+# shares one empty scope.
+LITERAL_ENV = Environment()
+
+# Bounds on what folding may compute, after CPython's AST optimizer.
+# Anything larger is left for evaluation, so that it is only paid for
+# if the expression is actually reached.
+MAX_INT_SIZE = 128  # bits
+MAX_STR_SIZE = 4096  # characters
+
+# Left-associative operators which can be collapsed into chains.
+SUM_OPS = {
+    t.Add: Op.add,
+    t.Subtract: Op.sub,
+}
+PRODUCT_OPS = {
+    t.Multiply: Op.mul,
+    t.Divide: Op.div,
+    t.IntegerDivide: Op.int_div,
+    t.Mod: Op.mod,
+}
+
+
+def children(node: t.AstNode) -> list[t.AstNode]:
+    child_nodes = []
+    for f in fields(node):
+        if not f.init:
+            continue
+
+        child = getattr(node, f.name)
+        if isinstance(child, t.AstNode):
+            child_nodes.append(child)
+        elif isinstance(child, list):
+            child_nodes.extend(c for c in child if isinstance(c, t.AstNode))
+
+    return child_nodes
+
+
+def optimize(node: t.AstNode) -> t.AstNode:
+    """
+    Optimize the tree rooted at `node`, bottom-up. Nodes are never
+    mutated; any node with a rewritten child is rebuilt.
+    """
+    changes = {}
+    settled = set()
+    if isinstance(node, t.If):
+        # Settle the condition before the branches, so that a branch
+        # which prune drops is never optimized.
+        condition = optimize(node.condition_block)
+        if isinstance(condition, t.Literal):
+            settled_node = replace(node, condition_block=condition)
+            if (pruned := prune(settled_node)) is not settled_node:
+                return optimize(pruned)
+
+        if condition is not node.condition_block:
+            changes["condition_block"] = condition
+        settled.add("condition_block")
+
+    for f in fields(node):
+        if not f.init or f.name in settled:
+            continue
+
+        child = getattr(node, f.name)
+        if isinstance(child, t.AstNode):
+            optimized = optimize(child)
+            if optimized is not child:
+                changes[f.name] = optimized
+
+        elif isinstance(child, list):
+            optimized_list = [
+                optimize(c) if isinstance(c, t.AstNode) else c
+                for c in child
+            ]
+            if any(a is not b for a, b in zip(optimized_list, child)):
+                changes[f.name] = optimized_list
+
+    if changes:
+        node = replace(node, **changes)
+
+    for rewrite in REWRITES:
+        node = rewrite(node)
+
+    return node
+
+
+def fold(node: t.AstNode) -> t.AstNode:
+    if isinstance(node, t.NestedBlock):
+        # A parenthesized literal declares nothing, so the scope it
+        # would create can be skipped.
+        match node.block.exprs:
+            case [t.Literal() as literal]:
+                return literal
+
+    op = FOLDABLE.get(type(node))
+    if op is None:
+        return node
+
+    operand_nodes = children(node)
+    if not all(isinstance(c, t.Literal) for c in operand_nodes):
+        return node
+
+    operands = [literal_value(c) for c in operand_nodes]
+    if any(o is None for o in operands) or not safe_to_fold(node, operands):
+        return node
+
+    try:
+        value = op(*operands)
+    except Exception:
+        # Leave it for evaluation (e.g. division by 0), so the error
+        # is only reported if the expression is actually reached.
+        return node
+
+    return t.Constant(value) if is_small(value) else node
+
+
+def literal_value(node: t.Literal) -> v.Value | None:
+    # A literal that fails to decode is left for evaluation to report,
+    # like any other error.
+    try:
+        return node.evaluate(LITERAL_ENV)
+    except Exception:
+        return None
+
+
+def is_small(value: v.Value) -> bool:
+    match value:
+        case v.Number(_val=int() as i):
+            return i.bit_length() <= MAX_INT_SIZE
+        case v.String(_str=s):
+            return len(s) <= MAX_STR_SIZE
+
+    return True
+
+
+def safe_to_fold(node: t.AstNode, operands: list[v.Value]) -> bool:
+    """
+    Whether folding `node` is cheap: its operands are small, and for
+    `**`, so is the result (int ** int grows with the exponent).
+    """
+    if not all(is_small(o) for o in operands):
+        return False
+
+    if isinstance(node, t.Pow):
+        match operands:
+            case [v.Number(_val=int() as base), v.Number(_val=int() as exp)] if exp > 0:
+                return base.bit_length() * exp <= MAX_INT_SIZE
+
+    return True
+
+
+def short_circuit(node: t.AstNode) -> t.AstNode:
+    # The lazy operators only need their left operand to decide which
+    # side is the result, so a literal there picks the side up front.
+    if not isinstance(node, (t.And, t.Or, t.Coalesce)):
+        return node
+
+    if not isinstance(node.lhs, t.Literal):
+        return node
+
+    lhs = literal_value(node.lhs)
+    if lhs is None:
+        return node
+
+    match node:
+        case t.And():
+            keep_lhs = not lhs
+        case t.Or():
+            keep_lhs = bool(lhs)
+        case _:
+            keep_lhs = not Op.eq(lhs, v.EMPTY)
+
+    return node.lhs if keep_lhs else node.rhs
+
+
+def prune(node: t.AstNode) -> t.AstNode:
+    # Branches do not get their own scope, so the live branch can stand
+    # in for the whole if expression. Applied by optimize() before the
+    # branches are visited, rather than as one of the REWRITES.
+    if not isinstance(node, t.If) or not isinstance(node.condition_block, t.Literal):
+        return node
+
+    condition = literal_value(node.condition_block)
+    if condition is None:
+        return node
+
+    if v.Boolean.truth(condition):
+        return node.true_expr
+
+    return node.false_expr if node.false_expr is not None else t.Empty()
+
+
+def declares(node: t.AstNode) -> bool:
+    """
+    Whether evaluating `node` can declare a name in the scope it is
+    evaluated in. Nested blocks and function bodies get their own scope,
+    so they are not searched.
+    """
+    if isinstance(node, (t.ConstDecl, t.VarDecl)):
+        return True
+
+    if isinstance(node, (t.NestedBlock, t.Function)):
+        return False
+
+    return any(declares(c) for c in children(node))
+
+
+def unscope(node: t.AstNode) -> t.AstNode:
+    # Without declarations the block's scope stays empty, so evaluating
+    # it directly in the enclosing scope keeps lookups from walking an
+    # extra level.
+    if isinstance(node, t.NestedBlock) and node.scoped:
+        if not declares(node.block):
+            return replace(node, scoped=False)
+
+    return node
+
+
+def flatten(node: t.AstNode) -> t.AstNode:
+    # Children are already flattened, so `a + b + c` arrives here as
+    # Add(Add(a, b), c) and `a + b + c + d` as Add(SumChain(...), d).
+    for ops, Chain in ((SUM_OPS, t.SumChain), (PRODUCT_OPS, t.ProductChain)):
+        if type(node) not in ops:
+            continue
+
+        op = ops[type(node)]
+        lhs = node.lhs
+
+        if type(lhs) is Chain:
+            return Chain([*lhs.operands, node.rhs], [*lhs.ops, op])
+
+        if type(lhs) in ops:
+            return Chain([lhs.lhs, lhs.rhs, node.rhs], [ops[type(lhs)], op])
+
+    return node
+
+
+REWRITES = [fold, short_circuit, unscope, flatten]
@@ -24,6 +24,9 @@ class Op:
     def _types_match(a: Value, b: Value) -> bool:
         return type(a) is type(b)
 
+    # Operations between two Numbers are by far the most common, so the
+    # methods below test for that case inline and only call the guard
+    # otherwise.
     @staticmethod
     def _type_guard(a: Value, b: Value, op_name: str | None = None) -> None:
         if not Op._types_match(a, b):
@@ -32,65 +35,91 @@ class Op:
 
     @staticmethod
     def eq(a: Value, b: Value) -> Value:
-        if not Op._types_match(a, b):
-            return Boolean(False)
+        # Also backs `!=` and `??`, so the checks are inlined. A value is
+        # always equal to itself, which skips walking shared arrays and
+        # objects as well as the singletons.
+        if a is b:
+            return TRUE
+        if type(a) is not type(b):
+            return FALSE
         return a.eq(b)
 
     @staticmethod
     def neq(a: Value, b: Value) -> Value:
-        return Op.not_(Op.eq(a, b))
+        return FALSE if Op.eq(a, b)._bool else TRUE
 
     @staticmethod
     def lt(a: Value, b: Value) -> Value:
-        Op._type_guard(a, b, "compare")
+        if type(a) is not Number or type(b) is not Number:
+            Op._type_guard(a, b, "compare")
         return a.lt(b)
 
     @staticmethod
     def gt(a: Value, b: Value) -> Value:
-        Op._type_guard(a, b, "compare")
+        if type(a) is not Number or type(b) is not Number:
+            Op._type_guard(a, b, "compare")
         return a.gt(b)
 
     @staticmethod
     def lte(a: Value, b: Value) -> Value:
-        return Op.not_(Op.gt(a, b))
+        if type(a) is not Number or type(b) is not Number:
+            Op._type_guard(a, b, "compare")
+        return a.lte(b)
 
     @staticmethod
     def gte(a: Value, b: Value) -> Value:
-        return Op.not_(Op.lt(a, b))
+        if type(a) is not Number or type(b) is not Number:
+            Op._type_guard(a, b, "compare")
+        return a.gte(b)
 
     @staticmethod
     def add(a: Value, b: Value) -> Value:
+        # + is also string concatenation, so both supported pairs are
+        # handled inline.
+        a_type = type(a)
+        if a_type is type(b):
+            if a_type is Number:
+                return Number(a._val + b._val)
+            if a_type is String:
+                return String(a._str + b._str)
+
         Op._type_guard(a, b, "add")
         return a.add(b)
 
     @staticmethod
     def sub(a: Value, b: Value) -> Value:
-        Op._type_guard(a, b, "subtract")
+        if type(a) is not Number or type(b) is not Number:
+            Op._type_guard(a, b, "subtract")
         return a.sub(b)
 
     @staticmethod
     def mul(a: Value, b: Value) -> Value:
-        Op._type_guard(a, b, "multiply")
+        if type(a) is not Number or type(b) is not Number:
+            Op._type_guard(a, b, "multiply")
         return a.mul(b)
 
     @staticmethod
     def div(a: Value, b: Value) -> Value:
-        Op._type_guard(a, b, "divide")
+        if type(a) is not Number or type(b) is not Number:
+            Op._type_guard(a, b, "divide")
         return a.div(b)
 
     @staticmethod
     def int_div(a: Value, b: Value) -> Value:
-        Op._type_guard(a, b, "integer divide")
+        if type(a) is not Number or type(b) is not Number:
+            Op._type_guard(a, b, "integer divide")
         return a.int_div(b)
 
     @staticmethod
     def mod(a: Value, b: Value) -> Value:
-        Op._type_guard(a, b, "mod")
+        if type(a) is not Number or type(b) is not Number:
+            Op._type_guard(a, b, "mod")
         return a.mod(b)
 
     @staticmethod
     def pow(a: Value, b: Value) -> Value:
-        Op._type_guard(a, b, "exponentiate")
+        if type(a) is not Number or type(b) is not Number:
+            Op._type_guard(a, b, "exponentiate")
         return a.pow(b)
 
     @staticmethod
@@ -99,7 +128,7 @@ class Op:
 
     @staticmethod
     def not_(a: Value) -> Value:
-        return Boolean(not Boolean.cast(a)._bool)
+        return FALSE if Boolean.truth(a) else TRUE
 
     @staticmethod
     def index_get(target: Value, index: Value) -> Value:
@@ -124,10 +153,11 @@ class Op:
 
 class Value[Subclass, TreeNode]():
     type_name: str
+    __slots__ = ()
 
     # Mainly for unit tests.
     def __bool__(self) -> bool:
-        return Boolean.cast(self)._bool
+        return Boolean.truth(self)
 
     @staticmethod
     def from_node(node: TreeNode, env: Environment) -> Subclass:
@@ -137,14 +167,30 @@ class Value[Subclass, TreeNode]():
 
     @classmethod
     def cast(cls, value: Value) -> Subclass:
+        if (result := cls.try_cast(value)) is None:
+            raise XbRuntimeError(
+                f"cannot cast type '{value.type_name}' to '{cls.type_name}'"
+            )
+
+        return result
+
+    @classmethod
+    def try_cast(cls, value: Value) -> Subclass | None:
+        """
+        Like `cast`, but gives None when `value` cannot be converted
+        instead of raising. Supported conversions override this.
+        """
         _ = value
-        raise XbRuntimeError(
-            f"cannot cast type '{value.type_name}' to '{cls.type_name}'"
-        )
+        return None
 
     def display(self) -> str:
         return self.__repr__()
 
+    def _display_into(self, out: list[str]) -> None:
+        # Containers override this to write their elements into the same
+        # buffer, so nested values are not built up as separate strings.
+        out.append(self.display())
+
     def eq(self, other: Subclass) -> Value:
         _ = other
         raise XbRuntimeError(
@@ -163,6 +209,18 @@ class Value[Subclass, TreeNode]():
             f"type '{self.type_name}' does not support ordering"
         )
 
+    def lte(self, other: Subclass) -> Value:
+        _ = other
+        raise XbRuntimeError(
+            f"type '{self.type_name}' does not support ordering"
+        )
+
+    def gte(self, other: Subclass) -> Value:
+        _ = other
+        raise XbRuntimeError(
+            f"type '{self.type_name}' does not support ordering"
+        )
+
     def add(self, other: Subclass) -> Value:
         _ = other
         raise XbRuntimeError(
@@ -243,46 +301,73 @@ class Value[Subclass, TreeNode]():
 
 class Empty(Value["Empty", "t.Empty"]):
     type_name = "()"
+    __slots__ = ()
+
+    _instance: Empty | None = None
+
+    def __new__(cls) -> Empty:
+        # There is only one (); constructing it returns EMPTY.
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+
+        return cls._instance
 
     @staticmethod
     def from_node(node, env):
-        return Empty()
+        return EMPTY
 
     def display(self) -> str:
         return self.type_name
 
     def eq(self, other) -> Value:
         # () is always equal to ()
-        return Boolean(True)
+        return TRUE
 
 
 class Boolean(Value["Boolean", "t.Bool"]):
     type_name = "boolean"
+    __slots__ = ("_bool",)
 
-    def __init__(self, val: bool) -> None:
-        self._bool = val
+    _instances: dict[bool, Boolean] = {}
+
+    def __new__(cls, val: bool) -> Boolean:
+        # There are only two booleans; constructing one returns TRUE or
+        # FALSE rather than a new object.
+        val = bool(val)
+        instance = cls._instances.get(val)
+        if instance is None:
+            instance = cls._instances[val] = super().__new__(cls)
+            instance._bool = val
+
+        return instance
 
     @staticmethod
     def from_node(node, env):
-        return Boolean(node.token == "true")
+        return TRUE if node.token == "true" else FALSE
 
     @classmethod
-    def cast(cls, value):
-        match value:
-            case Empty() | Boolean(_bool=False):
-                return Boolean(False)
-            case _:
-                return Boolean(True)
+    def try_cast(cls, value):
+        return TRUE if Boolean.truth(value) else FALSE
+
+    @staticmethod
+    def truth(value: Value) -> bool:
+        """
+        The truthiness of `value` as a Python bool: only `false` and `()`
+        are falsy. Prefer this to `cast` when the result is not kept.
+        """
+        # FALSE and EMPTY are the only instances of falsy values.
+        return value is not FALSE and value is not EMPTY
 
     def display(self) -> str:
         return "true" if self._bool else "false"
 
     def eq(self, other) -> Value:
-        return Boolean(self._bool == other._bool)
+        return TRUE if self._bool == other._bool else FALSE
 
 
 class String(Value["String", "t.String"]):
     type_name = "string"
+    __slots__ = ("_str",)
 
     def __init__(self, val: str) -> None:
         self._str = val
@@ -293,7 +378,7 @@ class String(Value["String", "t.String"]):
         return String(eval(node.token))
 
     @classmethod
-    def cast(cls, value):
+    def try_cast(cls, value):
         match value:
             case String(_str=s):
                 return String(s)
@@ -305,13 +390,19 @@ class String(Value["String", "t.String"]):
         return f'"{self._str}"'
 
     def eq(self, other) -> Value:
-        return Boolean(self._str == other._str)
+        return TRUE if self._str == other._str else FALSE
 
     def lt(self, other) -> Value:
-        return Boolean(self._str < other._str)
+        return TRUE if self._str < other._str else FALSE
 
     def gt(self, other) -> Value:
-        return Boolean(self._str > other._str)
+        return TRUE if self._str > other._str else FALSE
+
+    def lte(self, other) -> Value:
+        return TRUE if self._str <= other._str else FALSE
+
+    def gte(self, other) -> Value:
+        return TRUE if self._str >= other._str else FALSE
 
     def add(self, other) -> Value:
         return String(self._str + other._str)
@@ -319,6 +410,7 @@ class String(Value["String", "t.String"]):
 
 class Number(Value["Number", "t.Number"]):
     type_name = "number"
+    __slots__ = ("_val",)
 
     def __init__(self, val: (int | float)) -> None:
         if type(val) is int or (i := int(val)) != val:
@@ -335,9 +427,8 @@ class Number(Value["Number", "t.Number"]):
             return int(raw, base=0)
 
         if any(c in raw for c in [".", "e"]):
-            # float candidate (prefer int if whole)
-            f = float(raw)
-            return i if (i := int(f)) == f else f
+            # float candidate (Number() stores it as an int if whole)
+            return float(raw)
 
         return int(raw)
 
@@ -346,26 +437,35 @@ class Number(Value["Number", "t.Number"]):
         return Number(Number._parse_string(node.token))
 
     @classmethod
-    def cast(cls, value):
+    def try_cast(cls, value):
         match value:
             case Number(_val=v):
                 return Number(v)
             case String(_str=s):
-                return Number(Number._parse_string(s))
+                try:
+                    return Number(Number._parse_string(s))
+                except (ValueError, OverflowError):
+                    return None
 
-        return super().cast(value)
+        return None
 
     def display(self) -> str:
         return str(self._val)
 
     def eq(self, other) -> Value:
-        return Boolean(self._val == other._val)
+        return TRUE if self._val == other._val else FALSE
 
     def lt(self, other) -> Value:
-        return Boolean(self._val < other._val)
+        return TRUE if self._val < other._val else FALSE
 
     def gt(self, other) -> Value:
-        return Boolean(self._val > other._val)
+        return TRUE if self._val > other._val else FALSE
+
+    def lte(self, other) -> Value:
+        return TRUE if self._val <= other._val else FALSE
+
+    def gte(self, other) -> Value:
+        return TRUE if self._val >= other._val else FALSE
 
     def add(self, other) -> Value:
         return Number(self._val + other._val)
@@ -403,6 +503,7 @@ class Number(Value["Number", "t.Number"]):
 
 class Array(Value["Array", "t.Array"]):
     type_name = "array"
+    __slots__ = ("_list",)
 
     def __init__(self, vals: list[Value]) -> None:
         self._list = vals
@@ -412,22 +513,32 @@ class Array(Value["Array", "t.Array"]):
         return Array([expr.evaluate(env) for expr in node.exprs])
 
     @classmethod
-    def cast(cls, value: Value):
-        if type(value) is Array:
-            return value
-
-        return super().cast(value)
+    def try_cast(cls, value: Value):
+        return value if type(value) is Array else None
 
     def display(self) -> str:
+        out = []
+        self._display_into(out)
+        return "".join(out)
+
+    def _display_into(self, out: list[str]) -> None:
         # TODO: prettier printing?
-        return f"[{", ".join(v.display() for v in self._list)}]"
+        out.append("[")
+        for i, item in enumerate(self._list):
+            if i:
+                out.append(", ")
+            item._display_into(out)
+        out.append("]")
 
     def eq(self, other) -> Value:
         # TODO: decide on deep equal or reference equal. perhaps another
         # keyword to indicate reference equality (like Python `is`)?
-        len_eq = len(self._list) == len(other._list)
-        vals_eq = all(Op.eq(s, o) for s, o in zip(self._list, other._list))
-        return Boolean(len_eq and vals_eq)
+        if len(self._list) != len(other._list):
+            return FALSE
+
+        # Op.eq only ever returns the TRUE and FALSE singletons, so the
+        # elements can be compared and scanned without leaving C.
+        return FALSE if FALSE in map(Op.eq, self._list, other._list) else TRUE
 
     def _validate_index(self, index: Value) -> int:
         if type(index) is not Number:
@@ -435,94 +546,136 @@ class Array(Value["Array", "t.Array"]):
                 f"cannot index type '{self.type_name}' with type '{index.type_name}'"
             )
 
-        if type(index._val) is not int or index._val < 0:
+        i = index._val
+        if type(i) is not int or i < 0:
             raise XbRuntimeError(f"{self.type_name} index must be a positive integer")
 
-        if index._val >= len(self._list):
-            raise XbRuntimeError(f"{self.type_name} index out of range")
-
-        return index._val
+        return i
 
+    # The upper bound is left to the list itself, since indices are
+    # almost always in range.
     def index_get(self, index) -> Value:
-        return self._list[self._validate_index(index)]
+        try:
+            return self._list[self._validate_index(index)]
+        except IndexError:
+            raise XbRuntimeError(f"{self.type_name} index out of range") from None
 
     def index_set(self, index, item) -> None:
-        self._list[self._validate_index(index)] = item
+        try:
+            self._list[self._validate_index(index)] = item
+        except IndexError:
+            raise XbRuntimeError(f"{self.type_name} index out of range") from None
 
 
 class Object(Value["Object", "t.Object"]):
     type_name = "object"
+    __slots__ = ("_values", "_consts", "_labels", "_items")
 
-    @dataclass
+    @dataclass(slots=True)
     class Entry:
         value: Value
         is_const: bool
 
     def __init__(self, d: dict[str, Object.Entry]) -> None:
-        self._dict = d
+        self._values = {k: e.value for k, e in d.items()}
+        self._consts = frozenset(k for k, e in d.items() if e.is_const)
+        self._labels = None
+        self._items = None
+
+    @staticmethod
+    def _from_parts(values: dict[str, Value], consts: frozenset[str]) -> Object:
+        # Entries are only a construction format; objects keep values and
+        # constness apart, so reads need a single dict probe.
+        obj = Object.__new__(Object)
+        obj._values = values
+        obj._consts = consts
+        obj._labels = None
+        obj._items = None
+        return obj
 
     @staticmethod
     def from_node(node, env):
-        def entry_from_pair(pair: t.Pair) -> tuple[str, Object.Entry]:
+        values: dict[str, Value] = {}
+        consts = set()
+        for pair in node.pairs:
             key, value, const = pair.key_value_const(env)
-            return key, Object.Entry(value, const)
+            values[key] = value
+            if const:
+                consts.add(key)
+            else:
+                consts.discard(key)
 
-        return Object({
-            key: entry
-            for key, entry in map(entry_from_pair, node.pairs)
-        })
+        return Object._from_parts(values, frozenset(consts))
 
     @classmethod
-    def cast(cls, value: Value):
-        if type(value) is Object:
-            return value
-
-        return super().cast(value)
+    def try_cast(cls, value: Value):
+        return value if type(value) is Object else None
 
     def display(self) -> str:
+        out = []
+        self._display_into(out)
+        return "".join(out)
+
+    def _display_into(self, out: list[str]) -> None:
         # TODO: prettier printing?
-        def display_pair(k: str, e: Object.Entry) -> str:
-            # TODO: handle cyclic refrerences somehow
-            return (
-                f"{k} : {e.value.display()}"
-            ) if e.is_const else (
-                f"{k} = {e.value.display()}"
+        # TODO: handle cyclic refrerences somehow
+        if not self._values:
+            out.append("{}")
+            return
+
+        # Keys are fixed once an object is built (key_set only replaces
+        # values), so the text around each value is built once.
+        if self._labels is None:
+            self._labels = tuple(
+                ("{" if i == 0 else ", ") + (f"{k} : " if k in self._consts else f"{k} = ")
+                for i, k in enumerate(self._values)
             )
 
-        return f"{{{
-            ", ".join(display_pair(k, e) for k, e in self._dict.items())
-        }}}"
+        for label, value in zip(self._labels, self._values.values()):
+            out.append(label)
+            value._display_into(out)
+        out.append("}")
 
     def eq(self, other) -> Value:
         # TODO: handle cyclic references
-        count_eq = len(self._dict.items()) == len(other._dict.items())
-        items_eq = all(
-            k in other._dict.keys() \
-                and e.is_const == other._dict[k].is_const \
-                and Op.eq(e.value, other._dict[k].value)
-            for k, e in self._dict.items()
-        )
-        return Boolean(count_eq and items_eq)
+        if len(self._values) != len(other._values) or self._consts != other._consts:
+            return FALSE
 
-    def _validate_key(self, key: str) -> None:
-        if key not in self._dict.keys():
-            raise XbRuntimeError(f'unrecognized key "{key}"')
+        if self._items is None:
+            # Iterating a tuple is cheaper than a fresh items() view; it
+            # is kept until a field is assigned.
+            self._items = tuple(self._values.items())
+
+        for k, value in self._items:
+            o = other._values.get(k)
+            if o is None or not Op.eq(value, o)._bool:
+                return FALSE
+
+        return TRUE
 
     def key_get(self, key: str) -> Value:
-        self._validate_key(key)
-        return self._dict[key].value
+        # A single probe, rather than a membership test followed by
+        # an index.
+        value = self._values.get(key)
+        if value is None:
+            raise XbRuntimeError(f'unrecognized key "{key}"')
+
+        return value
 
     def key_set(self, key: str, item: Value) -> None:
-        self._validate_key(key)
+        if key not in self._values:
+            raise XbRuntimeError(f'unrecognized key "{key}"')
 
-        if self._dict[key].is_const:
+        if key in self._consts:
             raise XbRuntimeError(f'field "{key}" is constant')
 
-        self._dict[key].value = item
+        self._values[key] = item
+        self._items = None
 
 
 class Function(Value["Function", "t.Function"]):
     type_name = "function"
+    __slots__ = ("param_names", "body", "closure")
 
     def __init__(self, param_names: list[str], body: t.Expr, closure: Environment) -> None:
         self.param_names = param_names
@@ -532,24 +685,21 @@ class Function(Value["Function", "t.Function"]):
     @staticmethod
     def from_node(node, env):
         return Function(
-            [str(ident.token) for ident in node.params.identifiers],
+            [ident.name for ident in node.params.identifiers],
             node.body,
             env,
         )
 
     @classmethod
-    def cast(cls, value: Value):
-        if type(value) is Function:
-            return value
-
-        return super().cast(value)
+    def try_cast(cls, value: Value):
+        return value if type(value) is Function else None
 
     def display(self) -> str:
         return f"{self.type_name} ({", ".join(self.param_names)})"
 
     def eq(self, other) -> Value:
         # Functions are only equal by reference
-        return Boolean(self is other)
+        return TRUE if self is other else FALSE
 
     def call(self, args: list[Value]) -> Value:
         # TODO: create an environment with parameter names defined
@@ -570,3 +720,11 @@ class Function(Value["Function", "t.Function"]):
             call_env.declare_const(name, value)
 
         return self.body.evaluate(call_env)
+
+
+# Booleans and () are immutable, so one instance of each value is shared
+# instead of allocating a new object for every comparison or empty result.
+# Their constructors also return these instances.
+TRUE = Boolean(True)
+FALSE = Boolean(False)
+EMPTY = Empty()
@@ -0,0 +1,18 @@
+import pytest
+
+from xb.interpreter.environment import Environment
+
+
+@pytest.fixture
+def env() -> Environment:
+    return Environment()
+
+
+@pytest.fixture
+def parent_env() -> Environment:
+    return Environment()
+
+
+@pytest.fixture
+def child_env(parent_env: Environment) -> Environment:
+    return Environment(parent_env)
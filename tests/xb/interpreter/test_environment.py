@@ -1,33 +1,28 @@
 import pytest
 
 import xb.interpreter.value as v
-from xb.interpreter.environment import Environment
 from xb.interpreter.errors import XbRuntimeError
 from xb.interpreter.value import Op
 
 
-def test_getitem_raises_keyerror_for_missing_key():
-    env = Environment()
+def test_getitem_raises_keyerror_for_missing_key(env):
     with pytest.raises(XbRuntimeError):
         _ = env["undefined_key"]
 
 
-def test_setitem_raises_keyerror_for_missing_key():
-    env = Environment()
+def test_setitem_raises_keyerror_for_missing_key(env):
     with pytest.raises(XbRuntimeError):
         env["undefined_key"] = v.Boolean(True)
 
 
-def test_setitem_raises_keyerror_for_const_key():
-    env = Environment()
+def test_setitem_raises_keyerror_for_const_key(env):
     env.declare_const("const", v.Number(5))
 
     with pytest.raises(XbRuntimeError):
         env["const"] = v.Number(6)
 
 
-def test_setitem_works_for_variable_key():
-    env = Environment()
+def test_setitem_works_for_variable_key(env):
     env.declare_var("var", v.Number(5))
 
     env["var"] = v.Number(8)
@@ -35,8 +30,7 @@ def test_setitem_works_for_variable_key():
     assert Op.eq(env["var"], v.Number(8))
 
 
-def test_getitem_works():
-    env = Environment()
+def test_getitem_works(env):
     env.declare_const("const", v.Number(1))
     env.declare_var("var", v.String("hey"))
 
@@ -44,39 +38,54 @@ def test_getitem_works():
     assert Op.eq(env["var"], v.String("hey"))
 
 
-def test_getitem_resolves_parent_var():
-    parent_env = Environment()
+def test_getitem_resolves_parent_var(parent_env, child_env):
     parent_env.declare_const("parent_var", v.Number(42))
 
-    env = Environment(parent_env)
+    assert Op.eq(child_env["parent_var"], v.Number(42))
 
-    assert Op.eq(env["parent_var"], v.Number(42))
 
-
-def test_getitem_shadows_parent_var():
-    parent_env = Environment()
+def test_getitem_shadows_parent_var(parent_env, child_env):
     parent_env.declare_const("var", v.Number(42))
 
-    env = Environment(parent_env)
-    env.declare_var("var", v.Number(44))
+    child_env.declare_var("var", v.Number(44))
 
-    assert Op.eq(env["var"], v.Number(44))
+    assert Op.eq(child_env["var"], v.Number(44))
 
 
-def test_setitem_sets_parent_var():
-    parent_env = Environment()
+def test_setitem_sets_parent_var(parent_env, child_env):
     parent_env.declare_var("parent_var", v.Number(45))
 
-    env = Environment(parent_env)
-    env["parent_var"] = v.Number(46)
+    child_env["parent_var"] = v.Number(46)
 
-    assert Op.eq(env["parent_var"], v.Number(46))
+    assert Op.eq(child_env["parent_var"], v.Number(46))
     assert Op.eq(parent_env["parent_var"], v.Number(46))
 
 
-def test_cannot_redeclare_name():
-    env = Environment()
+def test_cannot_redeclare_name(env):
     env.declare_const("value", v.Number(5))
 
     with pytest.raises(XbRuntimeError):
         env.declare_var("value", v.Number(6))
+
+
+def test_is_const_resolves_parent_var(parent_env, child_env):
+    parent_env.declare_const("const", v.Number(1))
+    parent_env.declare_var("var", v.Number(2))
+
+    assert child_env.is_const("const")
+    assert not child_env.is_const("var")
+
+
+def test_lookup_returns_value_and_constness(parent_env, child_env):
+    parent_env.declare_const("const", v.Number(1))
+
+    child_env.declare_var("var", v.Number(2))
+
+    value, is_const = child_env.lookup("const")
+    assert Op.eq(value, v.Number(1)) and is_const
+
+    value, is_const = child_env.lookup("var")
+    assert Op.eq(value, v.Number(2)) and not is_const
+
+    with pytest.raises(XbRuntimeError):
+        child_env.lookup("undefined_key")
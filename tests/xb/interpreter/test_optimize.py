@@ -0,0 +1,172 @@
+import pytest
+from lark import Token
+
+import xb.interpreter.ast as t
+import xb.interpreter.optimize as optimize_module
+from xb.interpreter.environment import Environment
+from xb.interpreter.optimize import optimize
+from xb.interpreter.value import Number, Op
+
+
+def num(s: str) -> t.Number:
+    return t.Number(Token("SIGNED_NUMBER", s))
+
+
+def ident(s: str) -> t.Identifier:
+    return t.Identifier(Token("IDENT", s))
+
+
+def test_fold_arithmetic():
+    node = optimize(t.Add(num("1"), t.Multiply(num("2"), num("3"))))
+
+    assert isinstance(node, t.Constant)
+    assert Op.eq(node.evaluate(Environment()), Number(7))
+
+
+def test_fold_parenthesized_literal():
+    node = optimize(t.Negate(t.NestedBlock(t.Block([t.Add(num("1"), num("1"))]))))
+
+    assert isinstance(node, t.Constant)
+    assert Op.eq(node.evaluate(Environment()), Number(-2))
+
+
+def test_fold_keeps_runtime_errors():
+    node = t.Divide(num("1"), num("0"))
+    assert optimize(node) is node
+
+
+def test_fold_leaves_identifiers():
+    node = optimize(t.Add(ident("x"), t.Add(num("1"), num("2"))))
+
+    assert isinstance(node, t.Add)
+    assert isinstance(node.lhs, t.Identifier)
+    assert isinstance(node.rhs, t.Constant)
+
+
+def test_fold_does_not_mutate():
+    inner = t.Add(num("1"), num("2"))
+    block = t.Block([inner, None])
+
+    folded = optimize(block)
+
+    assert folded is not block
+    assert block.exprs[0] is inner
+    assert isinstance(folded.exprs[0], t.Constant)
+
+
+def test_flatten_sum_chain():
+    # x + 1 - 2 + x
+    node = optimize(
+        t.Add(t.Subtract(t.Add(ident("x"), num("1")), num("2")), ident("x"))
+    )
+
+    assert isinstance(node, t.SumChain)
+    assert len(node.operands) == 4
+    assert node.ops == [Op.add, Op.sub, Op.add]
+
+    env = Environment()
+    env.declare_const("x", Number(10))
+    assert Op.eq(node.evaluate(env), Number(19))
+
+
+def test_flatten_keeps_precedence():
+    # x * 2 + x / 4
+    node = optimize(
+        t.Add(t.Multiply(ident("x"), num("2")), t.Divide(ident("x"), num("4")))
+    )
+
+    assert isinstance(node, t.Add)
+
+    env = Environment()
+    env.declare_const("x", Number(8))
+    assert Op.eq(node.evaluate(env), Number(18))
+
+
+def test_short_circuit_literal_lhs():
+    true, false = t.Bool(Token("BOOL", "true")), t.Bool(Token("BOOL", "false"))
+
+    assert optimize(t.And(true, ident("x"))) == ident("x")
+    assert optimize(t.And(false, ident("x"))) is false
+    assert optimize(t.Or(true, ident("x"))) is true
+    assert optimize(t.Or(false, ident("x"))) == ident("x")
+
+    assert optimize(t.Coalesce(t.Empty(), ident("x"))) == ident("x")
+    assert optimize(t.Coalesce(num("0"), ident("x"))) == num("0")
+
+
+def test_fold_comparison():
+    node = optimize(t.LessThanOrEqual(num("2"), t.Add(num("1"), num("1"))))
+
+    assert isinstance(node, t.Constant)
+    assert node.evaluate(Environment())
+
+
+def test_prune_constant_if():
+    condition = t.NestedBlock(t.Block([t.GreaterThan(num("1"), num("2"))]))
+
+    assert optimize(t.If(condition, ident("x"), ident("y"))) == ident("y")
+    assert optimize(t.If(condition, ident("x"), None)) == t.Empty()
+
+
+def test_unscope_blocks_without_declarations():
+    plain = t.NestedBlock(t.Block([t.Add(ident("x"), num("1"))]))
+    declaring = t.NestedBlock(t.Block([t.ConstDecl(ident("y"), num("1")), ident("y")]))
+    nested = t.NestedBlock(t.Block([declaring, None]))
+
+    assert not optimize(plain).scoped
+    assert optimize(declaring).scoped
+    assert not optimize(nested).scoped
+
+
+def test_fold_skips_large_powers():
+    # 7 ** (10 ** 7): the exponent folds, the power is left for evaluation
+    node = optimize(t.Pow(num("7"), t.Pow(num("10"), num("7"))))
+
+    assert isinstance(node, t.Pow)
+    assert isinstance(node.rhs, t.Constant)
+
+    assert isinstance(optimize(t.Pow(num("2"), num("64"))), t.Constant)
+
+
+def test_fold_skips_large_powers_in_dead_branch():
+    condition = t.NestedBlock(t.Block([t.Bool(Token("BOOL", "false"))]))
+    dead = t.Pow(num("7"), t.Pow(num("10"), num("7")))
+
+    assert optimize(t.If(condition, dead, num("0"))) == num("0")
+
+
+def test_prune_skips_dead_branch(monkeypatch):
+    visited = []
+    monkeypatch.setattr(
+        optimize_module, "REWRITES", [lambda n: visited.append(n) or n, *optimize_module.REWRITES]
+    )
+    condition = t.NestedBlock(t.Block([t.GreaterThan(num("1"), num("2"))]))
+    dead = t.Add(num("1"), num("2"))
+
+    assert optimize(t.If(condition, dead, ident("y"))) == ident("y")
+    assert all(n is not dead for n in visited)
+
+
+def test_bad_string_literal_is_reported_when_reached():
+    bad = t.String(Token("ESCAPED_STRING", r'"\x"'))
+    condition = t.NestedBlock(t.Block([t.Bool(Token("BOOL", "false"))]))
+
+    assert optimize(t.If(condition, bad, num("1"))) == num("1")
+
+    node = optimize(t.Add(bad, t.String(Token("ESCAPED_STRING", '"a"'))))
+    assert isinstance(node, t.Add)
+
+    with pytest.raises(SyntaxError):
+        node.evaluate(Environment())
+
+
+def test_bad_number_literal_is_reported_when_reached():
+    condition = t.NestedBlock(t.Block([t.Bool(Token("BOOL", "false"))]))
+
+    assert optimize(t.If(condition, num("1e400"), num("3"))) == num("3")
+
+    node = optimize(t.Negate(num("1e400")))
+    assert isinstance(node, t.Negate)
+
+    with pytest.raises(OverflowError):
+        node.evaluate(Environment())
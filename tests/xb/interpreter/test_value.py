@@ -30,6 +30,10 @@ def test_empty_equality():
     assert Op.neq(Empty(), Boolean(False))
 
 
+def test_empty_is_singleton():
+    assert Empty() is Empty()
+
+
 # Boolean
 def test_bool_parsing():
     env = Environment()
@@ -46,6 +50,22 @@ def test_bool_casting():
     assert Op.eq(Boolean.cast(Boolean(False)), Boolean(False))
 
 
+def test_bool_truth():
+    assert not Boolean.truth(Empty())
+    assert not Boolean.truth(Boolean(False))
+    assert Boolean.truth(Boolean(True))
+    assert Boolean.truth(Number(0))
+    assert Boolean.truth(String(""))
+
+
+def test_bool_is_singleton():
+    assert Boolean(True) is Boolean(True)
+    assert Boolean(False) is Boolean(False)
+    assert Boolean(True) is not Boolean(False)
+    assert Boolean(None) is Boolean(False)
+    assert Boolean(1) is Boolean(True)
+
+
 def test_bool_display():
     assert Boolean(True).display() == "true"
     assert Boolean(False).display() == "false"
@@ -101,22 +121,17 @@ def test_string_concat():
 # Number
 def test_number_parsing():
     env = Environment()
+    tokens = [
+        Token("SIGNED_NUMBER", s)
+        for s in ["0xFF", "1e3", "40", "0.0", "5.5"]
+    ]
     (
         hex_0xFF,
         int_from_float_1000,
         int_40,
         int_from_float_00,
         float_5p5,
-    ) = map(
-        lambda node: Number.from_node(node, env),
-        (t.Number(Token("SIGNED_NUMBER", s)) for s in [
-            "0xFF",
-            "1e3",
-            "40",
-            "0.0",
-            "5.5",
-        ]),
-    )
+    ) = [Number.from_node(t.Number(tok), env) for tok in tokens]
 
     assert Op.eq(hex_0xFF, Number(0xFF))
     assert Op.eq(int_from_float_1000, Number(1e3))
@@ -137,6 +152,19 @@ def test_number_casting():
         Number.cast(Empty())
         Number.cast(Boolean(True))
 
+    with pytest.raises(XbRuntimeError):
+        Number.cast(String("five"))
+
+    with pytest.raises(XbRuntimeError):
+        Number.cast(String("1e400"))
+
+
+def test_number_try_cast():
+    assert Op.eq(Number.try_cast(String("5.5")), Number(5.5))
+    assert Number.try_cast(String("five")) is None
+    assert Number.try_cast(String("1e400")) is None
+    assert Number.try_cast(Empty()) is None
+
 
 def test_number_display():
     assert Number(5).display() == "5"
@@ -227,6 +255,15 @@ def test_array_access():
         array.index_set(String("10"), String("see ya"))
 
 
+def test_array_index_error_has_no_context():
+    array = Array([Number(1)])
+
+    with pytest.raises(XbRuntimeError) as e:
+        array.index_get(Number(5))
+
+    assert e.value.__suppress_context__
+
+
 # Object
 def test_object_parsing():
     env = Environment()
@@ -236,7 +273,7 @@ def test_object_parsing():
 def test_object_cast():
     obj = Object({ "sample": Object.Entry(Number(5), False) })
     obj2 = Object.cast(obj)
-    assert len(obj2._dict.items()) == 1
+    assert len(obj2._values) == 1
 
     with pytest.raises(XbRuntimeError):
         Object.cast(Number(1))
@@ -253,6 +290,14 @@ def test_object_display():
     assert Object({ "nested": Object.Entry(Object({}), True) }).display() == "{nested : {}}"
 
 
+def test_object_display_after_key_set():
+    obj = Object({ "a": Object.Entry(Number(1), True), "b": Object.Entry(Number(2), False) })
+    assert obj.display() == "{a : 1, b = 2}"
+
+    obj.key_set("b", String("hi"))
+    assert obj.display() == '{a : 1, b = "hi"}'
+
+
 def test_object_equality():
     assert Op.eq(
         Object({
@@ -292,3 +337,12 @@ def test_object_access():
 
     with pytest.raises(XbRuntimeError):
         obj.key_set("number", Number(2))
+
+
+def test_object_equality_after_key_set():
+    obj = Object({ "a": Object.Entry(Number(1), False) })
+    other = Object({ "a": Object.Entry(Number(1), False) })
+    assert Op.eq(obj, other)
+
+    obj.key_set("a", Number(2))
+    assert Op.neq(obj, other)